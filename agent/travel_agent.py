@@ -3,10 +3,13 @@ Travel Agent - LangChain ReAct Agent for Trip Planning
 Uses multiple tools to create optimized travel itineraries with budget enforcement
 """
 
+import asyncio
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -16,7 +19,17 @@ from tools.hotel_tool import search_hotels
 from tools.places_tool import search_places
 from tools.weather_tool import get_weather
 from tools.budget_tool import estimate_budget
-from config import DEFAULT_DAILY_EXPENSES, AVAILABLE_CITIES
+from config import DEFAULT_DAILY_EXPENSES, AVAILABLE_CITIES_TEXT
+from utils.helpers import format_currency
+
+
+# Dataset lookups are pure, so repeat plans (reruns, budget tweaks) are served
+# from memory. Cached results are shared between plans and with the loaded
+# datasets, so plan_trip copies anything mutable it hands back to the caller.
+search_flights = lru_cache(maxsize=128)(search_flights)
+search_hotels = lru_cache(maxsize=128)(search_hotels)
+search_places = lru_cache(maxsize=128)(search_places)
+# get_weather keeps its own time-limited forecast cache
 
 
 class TravelAgent:
@@ -25,6 +38,11 @@ class TravelAgent:
     Enforces budget constraints strictly.
     """
     
+    # Pool for the weather request, the only lookup that does network I/O. The agent
+    # is shared by every session, so it is sized for concurrent plans; the dataset
+    # searches are in-memory and run inline, never queueing behind a slow forecast.
+    _executor = ThreadPoolExecutor(max_workers=32)
+    
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
     
@@ -52,26 +70,31 @@ class TravelAgent:
             return {
                 "success": False,
                 "error": f"No direct flights from {source} to {destination}",
-                "suggestion": f"Try: {', '.join(AVAILABLE_CITIES)}",
+                "suggestion": f"Try: {AVAILABLE_CITIES_TEXT}",
                 "reasoning": reasoning
             }
         
+        # The forecast doesn't depend on flight/hotel selection, so fetch it in the
+        # background while the rest of the plan is worked out; cancelled if planning stops early
+        weather_future = self._executor.submit(get_weather, destination, start_date, num_days)
+        
         selected_flight = flight_result["recommended"]
         flight_cost = selected_flight["price"] * 2 * num_travelers  # Round trip
-        reasoning.append(f"✈️ Found flight: {selected_flight['airline']} at ₹{selected_flight['price']:,}")
+        reasoning.append(f"✈️ Found flight: {selected_flight['airline']} at {selected_flight['price_formatted']}")
         
         # Step 2: Calculate remaining budget for hotel
         nights = num_days - 1
+        daily_expense = 1500 if budget_preference == "budget" else DEFAULT_DAILY_EXPENSES
         if max_budget:
             # Calculate what we can afford for hotel
             # Budget = Flight + Hotel + Daily expenses
-            daily_expense = 1500 if budget_preference == "budget" else DEFAULT_DAILY_EXPENSES
             daily_cost = daily_expense * num_days * num_travelers
             remaining_for_hotel = max_budget - flight_cost - daily_cost
             max_hotel_price = remaining_for_hotel // nights if nights > 0 else remaining_for_hotel
             
             if max_hotel_price < 1000:
                 # Can't afford any reasonable hotel
+                weather_future.cancel()
                 return {
                     "success": False,
                     "error": f"Budget too low",
@@ -84,7 +107,7 @@ class TravelAgent:
                         "per_night_available": max_hotel_price
                     },
                     "suggestion": f"Minimum budget needed: ₹{flight_cost + (1500 * nights) + daily_cost:,}. Consider fewer days or different route.",
-                    "reasoning": reasoning + [f"❌ After flights (₹{flight_cost:,}) and expenses (₹{daily_cost:,}), only ₹{remaining_for_hotel:,} left for {nights} nights = ₹{max_hotel_price:,}/night (too low)"]
+                    "reasoning": [*reasoning, f"❌ After flights (₹{flight_cost:,}) and expenses (₹{daily_cost:,}), only ₹{remaining_for_hotel:,} left for {nights} nights = ₹{max_hotel_price:,}/night (too low)"]
                 }
             
             reasoning.append(f"💰 Budget: ₹{max_budget:,}. After flights & expenses, ₹{max_hotel_price:,}/night for hotel.")
@@ -94,22 +117,22 @@ class TravelAgent:
         # Step 3: Find hotel within budget
         reasoning.append("🔍 Searching for hotels...")
         
-        # Try to find cheapest hotel that fits budget
+        # Hotel sort and star tier only depend on the request, so fetch every hotel in
+        # the city and apply the budget cap and star tier locally
         hotel_sort = "price" if (budget_preference == "budget" or max_budget) else "value"
         hotel_stars = 1 if budget_preference == "budget" else min_hotel_stars
-        
-        hotel_result = search_hotels(
+        hotels = search_hotels(
             destination,
-            min_stars=hotel_stars,
-            max_price=max_hotel_price,
-            sort_by=hotel_sort
-        )
-        
-        # If no hotels found, try without star restriction
-        if not hotel_result["success"] and hotel_stars > 1:
-            hotel_result = search_hotels(destination, min_stars=1, max_price=max_hotel_price, sort_by="price")
+            min_stars=1,
+            sort_by=hotel_sort,
+            max_results=None
+        )["hotels"]
+        if max_hotel_price is not None:
+            # Try to find cheapest hotel that fits budget
+            hotels = [h for h in hotels if h["price_per_night"] <= max_hotel_price]
         
-        if not hotel_result["success"]:
+        if not hotels:
+            weather_future.cancel()
             return {
                 "success": False,
                 "error": f"No hotels in {destination} within ₹{max_hotel_price:,}/night",
@@ -117,24 +140,31 @@ class TravelAgent:
                 "reasoning": reasoning
             }
         
-        selected_hotel = hotel_result["recommended"]
-        hotel_cost = selected_hotel["price_per_night"] * nights
-        reasoning.append(f"🏨 Found: {selected_hotel['name']} ({selected_hotel['stars']}⭐) at ₹{selected_hotel['price_per_night']:,}/night")
+        # Prefer the requested star tier; if none fits, fall back to the cheapest hotel
+        preferred = [h for h in hotels if h["stars"] >= hotel_stars]
+        if preferred:
+            selected_hotel = preferred[0]
+        else:
+            selected_hotel = min(hotels, key=lambda h: h["price_per_night"])
+        reasoning.append(f"🏨 Found: {selected_hotel['name']} ({selected_hotel['stars']}⭐) at {selected_hotel['price_formatted']}")
         
         # Step 4: Calculate actual budget
-        daily_expense = 1500 if budget_preference == "budget" else DEFAULT_DAILY_EXPENSES
-        total_daily = daily_expense * num_days * num_travelers
-        total_cost = flight_cost + hotel_cost + total_daily
+        price_per_night = selected_hotel["price_per_night"]
+        hotel_cost, total_daily, total_cost = self._trip_costs(
+            flight_cost, price_per_night, daily_expense, nights, num_days, num_travelers
+        )
         
         # Verify within budget
         if max_budget and total_cost > max_budget:
             # Try to reduce daily expenses
             reduced_daily = 1000  # Minimum
-            total_daily = reduced_daily * num_days * num_travelers
-            total_cost = flight_cost + hotel_cost + total_daily
+            hotel_cost, total_daily, total_cost = self._trip_costs(
+                flight_cost, price_per_night, reduced_daily, nights, num_days, num_travelers
+            )
             daily_expense = reduced_daily
             
             if total_cost > max_budget:
+                weather_future.cancel()
                 return {
                     "success": False,
                     "error": f"Cannot plan trip within ₹{max_budget:,}",
@@ -150,23 +180,21 @@ class TravelAgent:
             
             reasoning.append(f"💡 Reduced daily expenses to ₹{reduced_daily:,} to fit budget")
         
-        reasoning.append(f"✅ Total: ₹{total_cost:,} {'(within budget!)' if max_budget and total_cost <= max_budget else ''}")
+        # Format each amount once and share the strings between reasoning and response
+        flight_formatted, hotel_formatted, daily_formatted, total_formatted = map(
+            format_currency, (flight_cost, hotel_cost, total_daily, total_cost)
+        )
+        reasoning.append(f"✅ Total: {total_formatted} {'(within budget!)' if max_budget and total_cost <= max_budget else ''}")
         
-        # Step 5: Get places
-        reasoning.append("🔍 Finding attractions...")
+        # Steps 5 & 6: Find places, and collect the weather fetched in the background
+        reasoning.extend(("🔍 Finding attractions...", "🌤️ Checking weather..."))
         places_result = search_places(destination, min_rating=3.5, max_results=num_days * 2)
-        
-        # Step 6: Get weather
-        reasoning.append("🌤️ Checking weather...")
-        weather_result = get_weather(destination, start_date, num_days)
+        weather_result = weather_future.result()
+        places = [dict(p) for p in places_result.get("places", [])]  # copies, not the cached dicts
+        forecast = weather_result.get("forecast", [])
         
         # Build itinerary
-        itinerary = self._build_itinerary(
-            destination, num_days,
-            places_result.get("places", []),
-            weather_result.get("forecast", []),
-            start_date
-        )
+        itinerary = self._build_itinerary(destination, num_days, places, forecast, start_date)
         
         # Determine trip category
         per_person = total_cost / num_travelers
@@ -176,6 +204,7 @@ class TravelAgent:
             category = {"name": "Mid-Range", "emoji": "💛", "description": "💛 Mid-Range Trip"}
         else:
             category = {"name": "Premium", "emoji": "💎", "description": "💎 Premium Trip"}
+        per_person_rounded = round(per_person)
         
         return {
             "success": True,
@@ -193,36 +222,36 @@ class TravelAgent:
                 "arrival": selected_flight["arrival_time"],
                 "duration": f"{selected_flight['duration_hours']}h",
                 "price": selected_flight["price"],
-                "price_formatted": f"₹{selected_flight['price']:,}",
+                "price_formatted": selected_flight["price_formatted"],
                 "round_trip_cost": flight_cost,
                 "reason": "Cheapest available flight"
             },
             "hotel": {
                 "name": selected_hotel["name"],
-                "stars": selected_hotel.get("stars", 3),
-                "price_per_night": selected_hotel.get("price_per_night", 3000),
-                "price_formatted": f"₹{selected_hotel['price_per_night']:,}/night",
-                "amenities": selected_hotel.get("amenities", []),
+                "stars": selected_hotel["stars"],
+                "price_per_night": selected_hotel["price_per_night"],
+                "price_formatted": selected_hotel["price_formatted"],
+                "amenities": list(selected_hotel["amenities"]),
                 "total_cost": hotel_cost,
                 "reason": "Best value within budget" if max_budget else "Best value"
             },
             "weather": {
-                "forecast": weather_result.get("forecast", []),
+                "forecast": forecast,
                 "summary": weather_result.get("summary", ""),
                 "recommendations": weather_result.get("recommendations", [])
             },
-            "places": places_result.get("places", []),
+            "places": places,
             "itinerary": itinerary,
             "budget": {
                 "breakdown": {
-                    "flights": {"total": flight_cost, "formatted": f"₹{flight_cost:,}", "description": f"Round-trip × {num_travelers}"},
-                    "accommodation": {"total": hotel_cost, "formatted": f"₹{hotel_cost:,}", "description": f"{nights} nights"},
-                    "daily_expenses": {"total": total_daily, "formatted": f"₹{total_daily:,}", "description": f"₹{daily_expense:,}/day × {num_days} days"}
+                    "flights": {"total": flight_cost, "formatted": flight_formatted, "description": f"Round-trip × {num_travelers}"},
+                    "accommodation": {"total": hotel_cost, "formatted": hotel_formatted, "description": f"{nights} nights"},
+                    "daily_expenses": {"total": total_daily, "formatted": daily_formatted, "description": f"{format_currency(daily_expense)}/day × {num_days} days"}
                 },
                 "total": total_cost,
-                "total_formatted": f"₹{total_cost:,}",
-                "per_person": round(per_person),
-                "per_person_formatted": f"₹{round(per_person):,}/person",
+                "total_formatted": total_formatted,
+                "per_person": per_person_rounded,
+                "per_person_formatted": f"{format_currency(per_person_rounded)}/person",
                 "category": category,
                 "within_budget": max_budget is None or total_cost <= max_budget,
                 "max_budget": max_budget,
@@ -231,9 +260,28 @@ class TravelAgent:
             "reasoning": reasoning
         }
     
+    @staticmethod
+    def _trip_costs(
+        flight_cost: int,
+        price_per_night: int,
+        daily_expense: int,
+        nights: int,
+        num_days: int,
+        num_travelers: int
+    ) -> tuple:
+        """Return (hotel_cost, total_daily, total_cost) in INR for one daily-expense level."""
+        hotel_cost = price_per_night * nights
+        total_daily = daily_expense * num_days * num_travelers
+        return hotel_cost, total_daily, flight_cost + hotel_cost + total_daily
+    
+    async def plan_trip_async(self, *args, **kwargs) -> Dict[str, Any]:
+        """
+        Async variant of plan_trip for callers running inside an event loop.
+        Accepts the same arguments and runs the planning off the loop thread.
+        """
+        return await asyncio.to_thread(self.plan_trip, *args, **kwargs)
+    
     def _build_itinerary(self, destination: str, num_days: int, places: list, weather: list, start_date: str) -> list:
-        from datetime import datetime, timedelta
-        
         try:
             start = datetime.strptime(start_date, "%Y-%m-%d")
         except:
@@ -242,12 +290,27 @@ class TravelAgent:
         itinerary = []
         places_per_day = max(1, len(places) // num_days) if places else 0
         
+        # Build all trip dates up front; isoformat is cheaper than strftime for the ISO key
+        trip_dates = [(start + timedelta(days=day)).date() for day in range(num_days)]
+        iso_dates = [d.isoformat() for d in trip_dates]
+        display_dates = [d.strftime("%a, %b %d") for d in trip_dates]
+        
+        # Slice each day's share of places in one pass
+        places_by_day = [
+            places[start_idx:start_idx + places_per_day]
+            for start_idx in range(0, num_days * places_per_day, places_per_day)
+        ] if places else [[] for _ in range(num_days)]
+        
+        # Pad the forecast to the trip length and render each day's weather label up front
+        day_weathers = list(weather[:num_days]) + [None] * max(0, num_days - len(weather))
+        weather_displays = [
+            f"{w['emoji']} {w['condition']} ({w['temperature_max']}°C)" if w else "—"
+            for w in day_weathers
+        ]
+        
         for day in range(num_days):
-            date = start + timedelta(days=day)
-            start_idx = day * places_per_day
-            end_idx = start_idx + places_per_day
-            day_places = places[start_idx:end_idx] if places else []
-            day_weather = weather[day] if day < len(weather) else None
+            day_places = places_by_day[day]
+            day_weather = day_weathers[day]
             
             activities = []
             if day == 0:
@@ -266,11 +329,11 @@ class TravelAgent:
             
             itinerary.append({
                 "day": day + 1,
-                "date": date.strftime("%Y-%m-%d"),
-                "date_display": date.strftime("%a, %b %d"),
+                "date": iso_dates[day],
+                "date_display": display_dates[day],
                 "places": day_places,
                 "weather": day_weather,
-                "weather_display": f"{day_weather['emoji']} {day_weather['condition']} ({day_weather['temperature_max']}°C)" if day_weather else "—",
+                "weather_display": weather_displays[day],
                 "activities": activities
             })
         
@@ -12,15 +12,16 @@ import sys
 sys.path.insert(0, os.path.dirname(__file__))
 
 from agent.travel_agent import TravelAgent
-from config import AVAILABLE_CITIES
+from config import AVAILABLE_CITIES_TEXT
 from utils.helpers import get_city_emoji, format_itinerary_for_export
 from utils.query_parser import QueryParser
 
 # Page config
 st.set_page_config(page_title="AI Travel Agent", page_icon="✈️", layout="wide", initial_sidebar_state="collapsed")
 
+# Static page assets, defined once and emitted as-is on every rerun
 # Clean, readable CSS
-st.markdown("""
+APP_CSS = """
 <style>
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
     
@@ -175,11 +176,39 @@ st.markdown("""
     }
     .stButton > button:hover { background: #4338CA; }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+HERO_HTML = '<div class="hero"><h1>✈️ AI Travel Agent</h1><p>Tell me where you want to go and your budget!</p></div>'
+
+WELCOME_HTML = '''
+<div class="bot-msg">
+    <strong>👋 Hi! I'm your AI Travel Agent.</strong><br><br>
+    Tell me your travel plans with budget, like:<br>
+    • "Plan 3 day trip from Mumbai to Goa under 15k"<br>
+    • "Budget trip from Delhi to Jaipur for 5 days"<br><br>
+    I'll find options that fit your budget, or tell you if it's not possible!
+</div>
+'''
+
+METRIC_CARD_HTML = '<div class="metric-card"><div class="metric-value">{value}</div><div class="metric-label">{label}</div></div>'
+
+st.markdown(APP_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def get_parser() -> QueryParser:
+    """Single QueryParser shared by all sessions (it keeps no per-user state)."""
+    return QueryParser()
+
+
+@st.cache_resource
+def get_agent() -> TravelAgent:
+    """Single TravelAgent shared by all sessions; plan_trip keeps no per-user state."""
+    return TravelAgent()
 
 
 def init_state():
-    defaults = {'messages': [], 'trip_plan': None, 'context': {}, 'parser': QueryParser(), 'key': 0}
+    defaults = {'messages': [], 'trip_plan': None, 'trip_exports': None, 'trip_html': None, 'context': {}, 'parser': get_parser(), 'key': 0}
     for k, v in defaults.items():
         if k not in st.session_state:
             st.session_state[k] = v
@@ -224,8 +253,8 @@ def build_missing_msg(missing, ctx):
     
     msg += "📝 **Need:**\n"
     for m in missing:
-        if m == 'source': msg += f"• **From?** ({', '.join(AVAILABLE_CITIES)})\n"
-        elif m == 'destination': msg += f"• **To?** ({', '.join(AVAILABLE_CITIES)})\n"
+        if m == 'source': msg += f"• **From?** ({AVAILABLE_CITIES_TEXT})\n"
+        elif m == 'destination': msg += f"• **To?** ({AVAILABLE_CITIES_TEXT})\n"
         elif m == 'days': msg += "• **How many days?**\n"
     
     return msg
@@ -237,7 +266,7 @@ def build_confirm_msg(ctx):
 
 
 def execute_plan(ctx):
-    agent = TravelAgent()
+    agent = get_agent()
     
     plan = agent.plan_trip(
         source=ctx['source'],
@@ -250,7 +279,18 @@ def execute_plan(ctx):
         max_budget=ctx.get('max_budget')
     )
     
+    # Serialize the downloads and render the HTML once per plan rather than on every
+    # rerun; built before anything is stored so the three keys always change together
+    exports = html = None
+    if plan.get('success'):
+        exports = {
+            'json': json.dumps(plan, indent=2, default=str),
+            'text': format_itinerary_for_export(plan)
+        }
+        html = build_trip_html(plan)
     st.session_state.trip_plan = plan
+    st.session_state.trip_exports = exports
+    st.session_state.trip_html = html
     
     if plan.get('success'):
         b = plan['budget']
@@ -280,51 +320,43 @@ def execute_plan(ctx):
         st.session_state.messages.append({"role": "bot", "content": error_content, "type": "error"})
 
 
-def render_trip(plan):
-    if not plan.get('success'):
-        return
-    
+def build_trip_html(plan) -> dict:
+    """Pre-render the static HTML fragments of a successful plan for render_trip."""
     s = plan['trip_summary']
     f = plan['flight']
     h = plan['hotel']
     b = plan['budget']
+    bd = b['breakdown']
     
-    # Header
-    st.markdown(f'''
-    <div class="trip-header">
-        <h2>🎉 {s['title']}</h2>
-        <p>{get_city_emoji(s['from'])} {s['from']} → {get_city_emoji(s['to'])} {s['to']} • {s['dates']} • {s['travelers']} traveler(s)</p>
-    </div>
-    ''', unsafe_allow_html=True)
-    
-    # Metrics
-    c1, c2, c3, c4 = st.columns(4)
-    c1.markdown(f'<div class="metric-card"><div class="metric-value">{b["total_formatted"]}</div><div class="metric-label">Total Cost</div></div>', unsafe_allow_html=True)
-    c2.markdown(f'<div class="metric-card"><div class="metric-value">{len(plan["itinerary"])}</div><div class="metric-label">Days</div></div>', unsafe_allow_html=True)
-    c3.markdown(f'<div class="metric-card"><div class="metric-value">{len(plan.get("places", []))}</div><div class="metric-label">Places</div></div>', unsafe_allow_html=True)
-    c4.markdown(f'<div class="metric-card"><div class="metric-value">{b["category"]["emoji"]}</div><div class="metric-label">{b["category"]["name"]}</div></div>', unsafe_allow_html=True)
-    
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    # Tabs
-    t1, t2, t3, t4 = st.tabs(["📅 Itinerary", "✈️ Flight & Hotel", "💰 Budget", "🤖 Reasoning"])
-    
-    with t1:
-        for day in plan['itinerary']:
-            st.markdown(f'''
+    itinerary = []  # day cards and their activities, joined into a single markdown block
+    for day in plan['itinerary']:
+        itinerary.append(f'''
             <div class="day-card">
                 <p class="day-title">Day {day['day']}</p>
                 <p class="day-date">{day['date_display']}</p>
                 <span class="day-weather">{day['weather_display']}</span>
             </div>
-            ''', unsafe_allow_html=True)
-            for act in day['activities']:
-                st.markdown(f"<p class='activity'>• {act}</p>", unsafe_allow_html=True)
+            ''')
+        itinerary.extend(f"<p class='activity'>• {act}</p>" for act in day['activities'])
     
-    with t2:
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown(f'''
+    stars = "⭐" * h['stars']
+    amenities = ", ".join(h['amenities'][:4])
+    
+    return {
+        'header': f'''
+    <div class="trip-header">
+        <h2>🎉 {s['title']}</h2>
+        <p>{get_city_emoji(s['from'])} {s['from']} → {get_city_emoji(s['to'])} {s['to']} • {s['dates']} • {s['travelers']} traveler(s)</p>
+    </div>
+    ''',
+        'metrics': [
+            METRIC_CARD_HTML.format(value=b["total_formatted"], label="Total Cost"),
+            METRIC_CARD_HTML.format(value=len(plan["itinerary"]), label="Days"),
+            METRIC_CARD_HTML.format(value=len(plan.get("places", [])), label="Places"),
+            METRIC_CARD_HTML.format(value=b["category"]["emoji"], label=b["category"]["name"]),
+        ],
+        'itinerary': "".join(itinerary),
+        'flight': f'''
             <div class="flight-card">
                 <h4>✈️ Flight</h4>
                 <p><strong>{f['airline']}</strong></p>
@@ -333,12 +365,8 @@ def render_trip(plan):
                 <p>Duration: {f['duration']}</p>
                 <p style="font-size:0.85rem; opacity:0.8;">Departure: {f['departure']}</p>
             </div>
-            ''', unsafe_allow_html=True)
-        
-        with col2:
-            stars = "⭐" * h['stars']
-            amenities = ", ".join(h['amenities'][:4])
-            st.markdown(f'''
+            ''',
+        'hotel': f'''
             <div class="hotel-card">
                 <h4>🏨 Hotel</h4>
                 <p><strong>{h['name']}</strong> {stars}</p>
@@ -346,11 +374,8 @@ def render_trip(plan):
                 <p>Total: ₹{h['total_cost']:,}</p>
                 <p style="font-size:0.85rem;">Amenities: {amenities}</p>
             </div>
-            ''', unsafe_allow_html=True)
-    
-    with t3:
-        bd = b['breakdown']
-        st.markdown(f'''
+            ''',
+        'budget': f'''
         <div class="budget-card">
             <h4>💰 Budget Breakdown</h4>
             <p>✈️ <strong>Flights:</strong> {bd['flights']['formatted']} <span style="opacity:0.7">({bd['flights']['description']})</span></p>
@@ -359,10 +384,44 @@ def render_trip(plan):
             <hr style="border-color:#FDE68A; margin: 12px 0;">
             <p style="font-size:1.1rem;"><strong>Total: {b['total_formatted']}</strong> ({b['per_person_formatted']})</p>
         </div>
-        ''', unsafe_allow_html=True)
-        
-        if b.get('within_budget') and b.get('max_budget'):
-            st.markdown(f'<span class="savings-badge">✅ Within your ₹{b["max_budget"]:,} budget!</span>', unsafe_allow_html=True)
+        ''',
+        'savings': f'<span class="savings-badge">✅ Within your ₹{b["max_budget"]:,} budget!</span>'
+                   if b.get('within_budget') and b.get('max_budget') else None,
+    }
+
+
+def render_trip(plan):
+    if not plan.get('success'):
+        return
+    
+    # Built once in execute_plan; reruns only replay the cached strings
+    html = st.session_state.trip_html
+    
+    # Header
+    st.markdown(html['header'], unsafe_allow_html=True)
+    
+    # Metrics
+    for col, card in zip(st.columns(4), html['metrics']):
+        col.markdown(card, unsafe_allow_html=True)
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Tabs
+    t1, t2, t3, t4 = st.tabs(["📅 Itinerary", "✈️ Flight & Hotel", "💰 Budget", "🤖 Reasoning"])
+    
+    with t1:
+        # One element for the whole itinerary instead of one per day card and activity
+        st.markdown(html['itinerary'], unsafe_allow_html=True)
+    
+    with t2:
+        col1, col2 = st.columns(2)
+        col1.markdown(html['flight'], unsafe_allow_html=True)
+        col2.markdown(html['hotel'], unsafe_allow_html=True)
+    
+    with t3:
+        st.markdown(html['budget'], unsafe_allow_html=True)
+        if html['savings']:
+            st.markdown(html['savings'], unsafe_allow_html=True)
     
     with t4:
         st.markdown("### 🤖 How I Planned This Trip")
@@ -372,27 +431,30 @@ def render_trip(plan):
     # Export
     st.markdown("---")
     col1, col2 = st.columns(2)
-    col1.download_button("📄 Download JSON", json.dumps(plan, indent=2, default=str), "trip.json", use_container_width=True)
-    col2.download_button("📝 Download Text", format_itinerary_for_export(plan), "trip.txt", use_container_width=True)
+    exports = st.session_state.trip_exports
+    col1.download_button("📄 Download JSON", exports['json'], "trip.json", use_container_width=True)
+    col2.download_button("📝 Download Text", exports['text'], "trip.txt", use_container_width=True)
 
 
 def main():
     init_state()
     
-    st.markdown('<div class="hero"><h1>✈️ AI Travel Agent</h1><p>Tell me where you want to go and your budget!</p></div>', unsafe_allow_html=True)
+    st.markdown(HERO_HTML, unsafe_allow_html=True)
     
     # Sidebar
     with st.sidebar:
         if st.button("🗑️ New Chat", use_container_width=True):
             st.session_state.messages = []
             st.session_state.trip_plan = None
+            st.session_state.trip_exports = None
+            st.session_state.trip_html = None
             st.session_state.context = {}
             st.session_state.key += 1
             st.rerun()
         
         st.markdown("---")
         st.markdown("**🌍 Cities**")
-        st.caption(", ".join(AVAILABLE_CITIES))
+        st.caption(AVAILABLE_CITIES_TEXT)
         
         st.markdown("---")
         st.markdown("**💡 Try saying:**")
@@ -411,15 +473,7 @@ def main():
     
     # Welcome
     if not st.session_state.messages:
-        st.markdown('''
-        <div class="bot-msg">
-            <strong>👋 Hi! I'm your AI Travel Agent.</strong><br><br>
-            Tell me your travel plans with budget, like:<br>
-            • "Plan 3 day trip from Mumbai to Goa under 15k"<br>
-            • "Budget trip from Delhi to Jaipur for 5 days"<br><br>
-            I'll find options that fit your budget, or tell you if it's not possible!
-        </div>
-        ''', unsafe_allow_html=True)
+        st.markdown(WELCOME_HTML, unsafe_allow_html=True)
     
     # Messages
     for msg in st.session_state.messages:
@@ -18,6 +18,9 @@ CITY_COORDINATES = {
 # Available cities in the dataset
 AVAILABLE_CITIES = list(CITY_COORDINATES.keys())
 
+# Comma-separated city list for user-facing messages
+AVAILABLE_CITIES_TEXT = ", ".join(AVAILABLE_CITIES)
+
 # Place types for filtering
 PLACE_TYPES = ["beach", "temple", "fort", "museum", "park", "market", "lake", "monument"]
 
@@ -5,8 +5,12 @@ LangChain Tools for AI Travel Agent
 from .flight_tool import FlightSearchTool, search_flights
 from .hotel_tool import HotelRecommendationTool, search_hotels
 from .places_tool import PlacesDiscoveryTool, search_places
-from .weather_tool import WeatherLookupTool, get_weather
+from .weather_tool import WeatherLookupTool, get_weather, get_weather_async, get_weather_batch
 from .budget_tool import BudgetEstimationTool, estimate_budget
+from .flight_tool import _flight_index
+from .hotel_tool import _hotels_by_city_sorted, _hotel_city_ranges
+from .places_tool import _places_by_city
+
 
 __all__ = [
     "FlightSearchTool",
@@ -18,5 +22,18 @@ __all__ = [
     "search_hotels",
     "search_places",
     "get_weather",
+    "get_weather_async",
+    "get_weather_batch",
     "estimate_budget",
 ]
+
+
+def _warm_datasets():
+    """Load and index the static datasets up front so the first search doesn't pay for it"""
+    _flight_index()
+    _hotels_by_city_sorted()
+    _hotel_city_ranges()
+    _places_by_city()
+
+
+_warm_datasets()
@@ -8,9 +8,6 @@ from typing import Optional
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from config import DEFAULT_DAILY_EXPENSES
 
 
@@ -30,28 +27,30 @@ class BudgetEstimationInput(BaseModel):
     )
 
 
-def estimate_budget(
+# (upper bound on per-person cost, name, emoji), checked in order
+_BUDGET_CATEGORIES = (
+    (10000, "Budget", "💚"),
+    (20000, "Mid-Range", "💛"),
+    (float("inf"), "Premium", "💎"),
+)
+
+# (condition on the computed numbers, tip), all matching tips are shown in order
+_BUDGET_TIPS = (
+    (lambda n: n["grand_total"] > 30000, "💡 Consider budget hotels or shorter stay to reduce costs"),
+    (lambda n: n["num_travelers"] > 2, "💡 Group discounts may be available for activities"),
+    (lambda n: n["total_daily_expenses"] > n["total_hotel_cost"], "💡 Pre-book activities online for better rates"),
+)
+
+
+def _compute_budget_numbers(
     flight_price: int,
     hotel_price_per_night: int,
     num_nights: int,
-    num_travelers: int = 1,
-    daily_expenses: int = DEFAULT_DAILY_EXPENSES,
-    include_return_flight: bool = True
+    num_travelers: int,
+    daily_expenses: int,
+    include_return_flight: bool
 ) -> dict:
-    """
-    Calculate total trip budget with itemized breakdown.
-    
-    Args:
-        flight_price: One-way flight price
-        hotel_price_per_night: Hotel cost per night
-        num_nights: Number of nights
-        num_travelers: Number of people
-        daily_expenses: Daily per-person expenses
-        include_return_flight: Include return journey
-        
-    Returns:
-        Dictionary with detailed budget breakdown
-    """
+    """Numeric part of the budget estimate, no display strings"""
     # Calculate flight costs
     flight_multiplier = 2 if include_return_flight else 1
     total_flight_cost = flight_price * flight_multiplier * num_travelers
@@ -67,68 +66,81 @@ def estimate_budget(
     grand_total = total_flight_cost + total_hotel_cost + total_daily_expenses
     per_person_total = grand_total / num_travelers if num_travelers > 0 else grand_total
     
+    return {
+        "flight_price": flight_price,
+        "hotel_price_per_night": hotel_price_per_night,
+        "num_nights": num_nights,
+        "num_days": num_days,
+        "num_travelers": num_travelers,
+        "daily_expenses": daily_expenses,
+        "include_return_flight": include_return_flight,
+        "flight_multiplier": flight_multiplier,
+        "total_flight_cost": total_flight_cost,
+        "total_hotel_cost": total_hotel_cost,
+        "total_daily_expenses": total_daily_expenses,
+        "grand_total": grand_total,
+        "per_person_total": per_person_total,
+    }
+
+
+def _format_budget(n: dict) -> dict:
+    """Build the itemized, display-ready budget from _compute_budget_numbers output"""
+    num_travelers = n["num_travelers"]
+    num_nights = n["num_nights"]
+    num_days = n["num_days"]
+    grand_total = n["grand_total"]
+    per_person_rounded = round(n["per_person_total"])
+    
     # Build breakdown
     breakdown = {
         "flights": {
-            "description": f"{'Round-trip' if include_return_flight else 'One-way'} flight × {num_travelers} traveler(s)",
-            "unit_price": flight_price,
-            "quantity": flight_multiplier * num_travelers,
-            "total": total_flight_cost,
-            "formatted": f"₹{total_flight_cost:,}"
+            "description": f"{'Round-trip' if n['include_return_flight'] else 'One-way'} flight × {num_travelers} traveler(s)",
+            "unit_price": n["flight_price"],
+            "quantity": n["flight_multiplier"] * num_travelers,
+            "total": n["total_flight_cost"],
+            "formatted": f"₹{n['total_flight_cost']:,}"
         },
         "accommodation": {
             "description": f"Hotel for {num_nights} night(s)",
-            "unit_price": hotel_price_per_night,
+            "unit_price": n["hotel_price_per_night"],
             "quantity": num_nights,
-            "total": total_hotel_cost,
-            "formatted": f"₹{total_hotel_cost:,}"
+            "total": n["total_hotel_cost"],
+            "formatted": f"₹{n['total_hotel_cost']:,}"
         },
         "daily_expenses": {
             "description": f"Food, transport & activities ({num_days} days × {num_travelers} person(s))",
-            "unit_price": daily_expenses,
+            "unit_price": n["daily_expenses"],
             "quantity": num_days * num_travelers,
-            "total": total_daily_expenses,
-            "formatted": f"₹{total_daily_expenses:,}"
+            "total": n["total_daily_expenses"],
+            "formatted": f"₹{n['total_daily_expenses']:,}"
         }
     }
     
     # Budget tips
-    tips = []
-    if grand_total > 30000:
-        tips.append("💡 Consider budget hotels or shorter stay to reduce costs")
-    if num_travelers > 2:
-        tips.append("💡 Group discounts may be available for activities")
-    if total_daily_expenses > total_hotel_cost:
-        tips.append("💡 Pre-book activities online for better rates")
+    tips = [tip for applies, tip in _BUDGET_TIPS if applies(n)]
     
     # Budget category
-    if per_person_total < 10000:
-        category = "Budget"
-        category_emoji = "💚"
-    elif per_person_total < 20000:
-        category = "Mid-Range"
-        category_emoji = "💛"
-    else:
-        category = "Premium"
-        category_emoji = "💎"
+    category, category_emoji = next(
+        (name, emoji) for limit, name, emoji in _BUDGET_CATEGORIES if n["per_person_total"] < limit
+    )
     
     return {
         "success": True,
         "breakdown": breakdown,
         "summary": {
-            "total_flight_cost": total_flight_cost,
-            "total_hotel_cost": total_hotel_cost,
-            "total_daily_expenses": total_daily_expenses,
+            "total_flight_cost": n["total_flight_cost"],
+            "total_hotel_cost": n["total_hotel_cost"],
+            "total_daily_expenses": n["total_daily_expenses"],
             "grand_total": grand_total,
-            "per_person_total": round(per_person_total),
+            "per_person_total": per_person_rounded,
             "formatted_total": f"₹{grand_total:,}",
-            "formatted_per_person": f"₹{round(per_person_total):,}/person"
+            "formatted_per_person": f"₹{per_person_rounded:,}/person"
         },
         "trip_info": {
             "num_travelers": num_travelers,
             "num_nights": num_nights,
             "num_days": num_days,
-            "include_return_flight": include_return_flight
+            "include_return_flight": n["include_return_flight"]
         },
         "category": {
             "name": category,
@@ -136,10 +148,38 @@ def estimate_budget(
             "description": f"{category_emoji} {category} Trip"
         },
         "tips": tips,
-        "reasoning": f"Total budget of ₹{grand_total:,} for {num_travelers} traveler(s) over {num_days} days. This is a {category.lower()} trip at ₹{round(per_person_total):,} per person."
+        "reasoning": f"Total budget of ₹{grand_total:,} for {num_travelers} traveler(s) over {num_days} days. This is a {category.lower()} trip at ₹{per_person_rounded:,} per person."
     }
 
 
+def estimate_budget(
+    flight_price: int,
+    hotel_price_per_night: int,
+    num_nights: int,
+    num_travelers: int = 1,
+    daily_expenses: int = DEFAULT_DAILY_EXPENSES,
+    include_return_flight: bool = True
+) -> dict:
+    """
+    Calculate total trip budget with itemized breakdown.
+    
+    Args:
+        flight_price: One-way flight price
+        hotel_price_per_night: Hotel cost per night
+        num_nights: Number of nights
+        num_travelers: Number of people
+        daily_expenses: Daily per-person expenses
+        include_return_flight: Include return journey
+        
+    Returns:
+        Dictionary with detailed budget breakdown
+    """
+    return _format_budget(_compute_budget_numbers(
+        flight_price, hotel_price_per_night, num_nights,
+        num_travelers, daily_expenses, include_return_flight
+    ))
+
+
 @tool(args_schema=BudgetEstimationInput)
 def BudgetEstimationTool(
     flight_price: int,
@@ -157,4 +197,4 @@ def BudgetEstimationTool(
         flight_price, hotel_price_per_night, num_nights,
         num_travelers, daily_expenses, include_return_flight
     )
-    return json.dumps(result, indent=2)
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
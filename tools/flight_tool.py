@@ -3,9 +3,12 @@ Flight Search Tool for AI Travel Agent
 Searches flights.json dataset with filtering and ranking capabilities
 """
 
+import heapq
 import json
 import os
-from typing import Optional, Literal
+from collections import defaultdict
+from functools import lru_cache
+from typing import NamedTuple, Optional, Literal
 from datetime import datetime
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
@@ -16,10 +19,52 @@ DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Data")
 FLIGHTS_FILE = os.path.join(DATA_DIR, "flights.json")
 
 
+@lru_cache(maxsize=1)
 def load_flights():
-    """Load flights data from JSON file"""
+    """Load flights data from JSON file (parsed once, the dataset is static)"""
     with open(FLIGHTS_FILE, "r") as f:
-        return json.load(f)
+        flights = json.load(f)
+    
+    # Duration and display price for each flight
+    for flight in flights:
+        dep = datetime.fromisoformat(flight["departure_time"])
+        arr = datetime.fromisoformat(flight["arrival_time"])
+        flight["duration_hours"] = round((arr - dep).total_seconds() / 3600, 1)
+        flight["price_formatted"] = f"₹{flight['price']:,}"
+    
+    return tuple(flights)
+
+
+class _FlightRecord(NamedTuple):
+    """Compact search-time view of a flight"""
+    price: int
+    duration_hours: float
+    airline: str
+    emit: dict  # fields returned for each result; search_flights only adds the rank
+
+
+@lru_cache(maxsize=1)
+def _flight_index():
+    """Flight records grouped by case-folded (from, to) route"""
+    index = defaultdict(list)
+    for f in load_flights():
+        index[(f["from"].casefold(), f["to"].casefold())].append(_FlightRecord(
+            price=f["price"],
+            duration_hours=f["duration_hours"],
+            airline=f["airline"],
+            emit={
+                "flight_id": f["flight_id"],
+                "airline": f["airline"],
+                "from": f["from"],
+                "to": f["to"],
+                "departure_time": f["departure_time"],
+                "arrival_time": f["arrival_time"],
+                "duration_hours": f["duration_hours"],
+                "price": f["price"],
+                "price_formatted": f["price_formatted"]
+            }
+        ))
+    return dict(index)
 
 
 class FlightSearchInput(BaseModel):
@@ -51,14 +96,8 @@ def search_flights(
     Returns:
         Dictionary with flight options and reasoning
     """
-    flights = load_flights()
-    
-    # Filter by source and destination (case-insensitive)
-    matching_flights = [
-        f for f in flights
-        if f["from"].lower() == source.lower() 
-        and f["to"].lower() == destination.lower()
-    ]
+    # Look up the route (case-insensitive); the indexed list is shared, never mutate it
+    matching_flights = _flight_index().get((source.casefold(), destination.casefold()), ())
     
     if not matching_flights:
         return {
@@ -68,46 +107,23 @@ def search_flights(
             "reasoning": f"The dataset doesn't contain direct flights from {source} to {destination}."
         }
     
-    # Calculate duration for each flight
-    for flight in matching_flights:
-        dep = datetime.fromisoformat(flight["departure_time"])
-        arr = datetime.fromisoformat(flight["arrival_time"])
-        duration_hours = (arr - dep).total_seconds() / 3600
-        flight["duration_hours"] = round(duration_hours, 1)
-    
-    # Sort based on preference
+    # Pick the top results based on preference (partial sort, stable like sorted())
     if sort_by == "cheapest":
-        matching_flights.sort(key=lambda x: x["price"])
+        top_flights = heapq.nsmallest(max_results, matching_flights, key=lambda x: x.price)
         reasoning = "Sorted by lowest price to maximize savings."
     else:
-        matching_flights.sort(key=lambda x: x["duration_hours"])
+        top_flights = heapq.nsmallest(max_results, matching_flights, key=lambda x: x.duration_hours)
         reasoning = "Sorted by shortest duration to save travel time."
     
-    # Get top results
-    top_flights = matching_flights[:max_results]
-    
     # Format results
-    formatted_flights = []
-    for i, f in enumerate(top_flights):
-        formatted_flights.append({
-            "rank": i + 1,
-            "flight_id": f["flight_id"],
-            "airline": f["airline"],
-            "from": f["from"],
-            "to": f["to"],
-            "departure_time": f["departure_time"],
-            "arrival_time": f["arrival_time"],
-            "duration_hours": f["duration_hours"],
-            "price": f["price"],
-            "price_formatted": f"₹{f['price']:,}"
-        })
+    formatted_flights = [{"rank": i, **f.emit} for i, f in enumerate(top_flights, 1)]
     
     # Generate selection reasoning
     if top_flights:
         best = top_flights[0]
         selection_reason = (
-            f"Selected {best['airline']} at ₹{best['price']:,} "
-            f"({best['duration_hours']}h flight) as the {'cheapest' if sort_by == 'cheapest' else 'fastest'} option."
+            f"Selected {best.airline} at ₹{best.price:,} "
+            f"({best.duration_hours}h flight) as the {'cheapest' if sort_by == 'cheapest' else 'fastest'} option."
         )
     else:
         selection_reason = "No flights available for selection."
@@ -123,6 +139,13 @@ def search_flights(
     }
 
 
+@lru_cache(maxsize=256)
+def _flight_search_json(source: str, destination: str, sort_by: str, max_results: int) -> str:
+    """Serialized search_flights result; the dataset is static, so repeat queries reuse it"""
+    result = search_flights(source, destination, sort_by, max_results)
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
+
+
 @tool(args_schema=FlightSearchInput)
 def FlightSearchTool(
     source: str,
@@ -134,5 +157,4 @@ def FlightSearchTool(
     Search for flights between two cities. Returns available flights sorted by price or duration.
     Use this tool when you need to find flight options for travel planning.
     """
-    result = search_flights(source, destination, sort_by, max_results)
-    return json.dumps(result, indent=2)
+    return _flight_search_json(source, destination, sort_by, max_results)
@@ -5,20 +5,120 @@ Searches hotels.json dataset with filtering and ranking capabilities
 
 import json
 import os
-from typing import Optional, List, Literal
+from collections import defaultdict
+from functools import lru_cache
+from typing import NamedTuple, Optional, List, Literal
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
+from config import HOTEL_AMENITIES
+
 
 # Get the data file path
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Data")
 HOTELS_FILE = os.path.join(DATA_DIR, "hotels.json")
 
+# One bit per amenity, so a required-amenities check is a single mask test
+_AMENITY_BIT = {name: 1 << i for i, name in enumerate(HOTEL_AMENITIES)}
+
 
+@lru_cache(maxsize=1)
 def load_hotels():
-    """Load hotels data from JSON file"""
+    """Load hotels data from JSON file (parsed once, the dataset is static)"""
     with open(HOTELS_FILE, "r") as f:
-        return json.load(f)
+        hotels = json.load(f)
+    
+    for hotel in hotels:
+        # Value score (stars per 1000 INR)
+        hotel["value_score"] = round(hotel["stars"] / (hotel["price_per_night"] / 1000), 2)
+        # Display strings
+        hotel["stars_display"] = "⭐" * hotel["stars"]
+        hotel["price_formatted"] = f"₹{hotel['price_per_night']:,}/night"
+    
+    return tuple(hotels)
+
+
+class _HotelRecord(NamedTuple):
+    """Compact search-time view of a hotel"""
+    stars: int
+    price_per_night: int
+    value_score: float
+    amenity_bits: int
+    name: str
+    amenities: tuple
+    emit: dict  # fields returned for each result; search_hotels adds the rank and copies the amenities
+
+
+@lru_cache(maxsize=1)
+def _hotels_by_city():
+    """Hotel records grouped by case-folded city"""
+    index = defaultdict(list)
+    for h in load_hotels():
+        # Amenity bitmask for case-insensitive filtering; amenities missing
+        # from config still get their own bit
+        bits = 0
+        for amenity in h["amenities"]:
+            bits |= _AMENITY_BIT.setdefault(amenity.casefold(), 1 << len(_AMENITY_BIT))
+        index[h["city"].casefold()].append(_HotelRecord(
+            stars=h["stars"],
+            price_per_night=h["price_per_night"],
+            value_score=h["value_score"],
+            amenity_bits=bits,
+            name=h["name"],
+            amenities=tuple(h["amenities"]),
+            emit={
+                "hotel_id": h["hotel_id"],
+                "name": h["name"],
+                "city": h["city"],
+                "stars": h["stars"],
+                "stars_display": h["stars_display"],
+                "price_per_night": h["price_per_night"],
+                "price_formatted": h["price_formatted"],
+                "amenities": h["amenities"],
+                "value_score": h["value_score"]
+            }
+        ))
+    return dict(index)
+
+
+@lru_cache(maxsize=1)
+def _hotels_by_city_sorted():
+    """Each city's hotels pre-sorted once per sort mode ('price', 'stars', 'value')"""
+    return {
+        city: {
+            "price": sorted(hotels, key=lambda x: x.price_per_night),
+            "stars": sorted(hotels, key=lambda x: x.stars, reverse=True),
+            "value": sorted(hotels, key=lambda x: x.value_score, reverse=True),
+        }
+        for city, hotels in _hotels_by_city().items()
+    }
+
+
+@lru_cache(maxsize=1)
+def _hotel_city_ranges():
+    """(min price, max price, min stars, max stars) per case-folded city"""
+    return {
+        city: (
+            min(h.price_per_night for h in hotels),
+            max(h.price_per_night for h in hotels),
+            min(h.stars for h in hotels),
+            max(h.stars for h in hotels),
+        )
+        for city, hotels in _hotels_by_city().items()
+    }
+
+
+@lru_cache(maxsize=64)
+def _required_bits(items: tuple) -> Optional[int]:
+    """Bitmask of the given amenities, or None if one is not offered by any hotel"""
+    _hotels_by_city()  # make sure every dataset amenity has its bit
+    bits = 0
+    for item in items:
+        bit = _AMENITY_BIT.get(item.casefold())
+        if bit is None:
+            return None
+        bits |= bit
+    return bits
 
 
 class HotelSearchInput(BaseModel):
@@ -43,7 +143,7 @@ def search_hotels(
     max_price: Optional[int] = None,
     required_amenities: Optional[List[str]] = None,
     sort_by: str = "value",
-    max_results: int = 3
+    max_results: Optional[int] = 3
 ) -> dict:
     """
     Search for hotels in a city with various filters.
@@ -54,18 +154,17 @@ def search_hotels(
         max_price: Maximum price per night
         required_amenities: List of required amenities
         sort_by: Sort method ('price', 'stars', 'value')
-        max_results: Maximum results to return
+        max_results: Maximum results to return (None for every match)
         
     Returns:
         Dictionary with hotel options and reasoning
     """
-    hotels = load_hotels()
-    
-    # Filter by city (case-insensitive)
-    matching_hotels = [
-        h for h in hotels
-        if h["city"].lower() == city.lower()
-    ]
+    # Look up the city (case-insensitive), already in the requested order;
+    # the filters below keep that order, so no sorting is needed per call.
+    # The indexed lists are shared, never mutate them.
+    city_key = city.casefold()
+    sort_mode = sort_by if sort_by in ("price", "stars") else "value"
+    matching_hotels = _hotels_by_city_sorted().get(city_key, {}).get(sort_mode)
     
     if not matching_hotels:
         return {
@@ -75,19 +174,26 @@ def search_hotels(
             "reasoning": f"The dataset doesn't contain hotels in {city}."
         }
     
+    # Only scan for star/price bounds that fall inside the city's range;
+    # a bound outside it either keeps every hotel or rules them all out
+    lowest_price, highest_price, lowest_stars, highest_stars = _hotel_city_ranges()[city_key]
+    if min_stars > highest_stars or (max_price and max_price < lowest_price):
+        matching_hotels = []
+    
     # Filter by minimum stars
-    matching_hotels = [h for h in matching_hotels if h["stars"] >= min_stars]
+    if min_stars > lowest_stars:
+        matching_hotels = [h for h in matching_hotels if h.stars >= min_stars]
     
     # Filter by max price
-    if max_price:
-        matching_hotels = [h for h in matching_hotels if h["price_per_night"] <= max_price]
+    if max_price and max_price < highest_price:
+        matching_hotels = [h for h in matching_hotels if h.price_per_night <= max_price]
     
     # Filter by required amenities
     if required_amenities:
-        required_set = set(a.lower() for a in required_amenities)
-        matching_hotels = [
+        required = _required_bits(tuple(required_amenities))
+        matching_hotels = [] if required is None else [
             h for h in matching_hotels
-            if required_set.issubset(set(a.lower() for a in h["amenities"]))
+            if h.amenity_bits & required == required
         ]
     
     if not matching_hotels:
@@ -98,47 +204,29 @@ def search_hotels(
             "reasoning": "Try relaxing filters (lower stars, higher budget, fewer amenities)."
         }
     
-    # Calculate value score (stars per 1000 INR)
-    for hotel in matching_hotels:
-        hotel["value_score"] = round(hotel["stars"] / (hotel["price_per_night"] / 1000), 2)
-    
-    # Sort based on preference
-    if sort_by == "price":
-        matching_hotels.sort(key=lambda x: x["price_per_night"])
+    if sort_mode == "price":
         reasoning = "Sorted by lowest price to stay within budget."
-    elif sort_by == "stars":
-        matching_hotels.sort(key=lambda x: x["stars"], reverse=True)
+    elif sort_mode == "stars":
         reasoning = "Sorted by highest star rating for best quality."
     else:  # value
-        matching_hotels.sort(key=lambda x: x["value_score"], reverse=True)
         reasoning = "Sorted by best value (star rating relative to price)."
     
     # Get top results
     top_hotels = matching_hotels[:max_results]
     
-    # Format results
-    formatted_hotels = []
-    for i, h in enumerate(top_hotels):
-        formatted_hotels.append({
-            "rank": i + 1,
-            "hotel_id": h["hotel_id"],
-            "name": h["name"],
-            "city": h["city"],
-            "stars": h["stars"],
-            "stars_display": "⭐" * h["stars"],
-            "price_per_night": h["price_per_night"],
-            "price_formatted": f"₹{h['price_per_night']:,}/night",
-            "amenities": h["amenities"],
-            "value_score": h["value_score"]
-        })
+    # Format results; each gets its own amenities list so callers can't edit the dataset
+    formatted_hotels = [
+        {"rank": i, **h.emit, "amenities": list(h.amenities)}
+        for i, h in enumerate(top_hotels, 1)
+    ]
     
     # Generate selection reasoning
     if top_hotels:
         best = top_hotels[0]
         selection_reason = (
-            f"Selected {best['name']} ({best['stars']}-star) at ₹{best['price_per_night']:,}/night. "
-            f"Amenities: {', '.join(best['amenities'])}. "
-            f"Value score: {best['value_score']} (higher is better)."
+            f"Selected {best.name} ({best.stars}-star) at ₹{best.price_per_night:,}/night. "
+            f"Amenities: {', '.join(best.amenities)}. "
+            f"Value score: {best.value_score} (higher is better)."
         )
     else:
         selection_reason = "No hotels available for selection."
@@ -154,6 +242,20 @@ def search_hotels(
     }
 
 
+@lru_cache(maxsize=256)
+def _hotel_search_json(
+    city: str,
+    min_stars: int,
+    max_price: Optional[int],
+    required_amenities: Optional[tuple],
+    sort_by: str,
+    max_results: int
+) -> str:
+    """Serialized search_hotels result; the dataset is static, so repeat queries reuse it"""
+    result = search_hotels(city, min_stars, max_price, required_amenities, sort_by, max_results)
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
+
+
 @tool(args_schema=HotelSearchInput)
 def HotelRecommendationTool(
     city: str,
@@ -167,5 +269,5 @@ def HotelRecommendationTool(
     Search for hotels in a city with filters for stars, price, and amenities.
     Use this tool when you need to find accommodation options for travel planning.
     """
-    result = search_hotels(city, min_stars, max_price, required_amenities, sort_by, max_results)
-    return json.dumps(result, indent=2)
+    amenities = tuple(required_amenities) if required_amenities is not None else None
+    return _hotel_search_json(city, min_stars, max_price, amenities, sort_by, max_results)
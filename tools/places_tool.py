@@ -3,9 +3,12 @@ Places Discovery Tool for AI Travel Agent
 Searches places.json dataset for attractions and points of interest
 """
 
+import heapq
 import json
 import os
-from typing import Optional, List
+from collections import defaultdict
+from functools import lru_cache
+from typing import NamedTuple, Optional, List
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
@@ -15,10 +18,60 @@ DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Data")
 PLACES_FILE = os.path.join(DATA_DIR, "places.json")
 
 
+@lru_cache(maxsize=1)
 def load_places():
-    """Load places data from JSON file"""
+    """Load places data from JSON file (parsed once, the dataset is static)"""
     with open(PLACES_FILE, "r") as f:
-        return json.load(f)
+        places = json.load(f)
+    
+    # Display strings
+    for place in places:
+        place["type_emoji"] = get_type_emoji(place["type"])
+        place["rating_display"] = f"{'⭐' * int(place['rating'])} ({place['rating']})"
+    
+    return tuple(places)
+
+
+class _PlaceRecord(NamedTuple):
+    """Compact search-time view of a place"""
+    rating: float
+    type: str
+    type_key: str  # case-folded type for case-insensitive filtering
+    emit: dict  # fields returned for each result; search_places only adds the rank
+
+
+@lru_cache(maxsize=1)
+def _places_by_city():
+    """Place records grouped by case-folded city"""
+    index = defaultdict(list)
+    for p in load_places():
+        index[p["city"].casefold()].append(_PlaceRecord(
+            rating=p["rating"],
+            type=p["type"],
+            type_key=p["type"].casefold(),
+            emit={
+                "place_id": p["place_id"],
+                "name": p["name"],
+                "city": p["city"],
+                "type": p["type"],
+                "type_emoji": p["type_emoji"],
+                "rating": p["rating"],
+                "rating_display": p["rating_display"]
+            }
+        ))
+    return dict(index)
+
+
+@lru_cache(maxsize=32)
+def _day_chunks(n: int, per: int = 3) -> tuple:
+    """(start, end) slice bounds splitting n items into days of `per` places"""
+    return tuple((i, min(i + per, n)) for i in range(0, n, per))
+
+
+@lru_cache(maxsize=64)
+def _norm_set(items: tuple) -> frozenset:
+    """Case-folded frozenset of the given filter values"""
+    return frozenset(x.casefold() for x in items)
 
 
 class PlacesSearchInput(BaseModel):
@@ -50,13 +103,8 @@ def search_places(
     Returns:
         Dictionary with places and reasoning for day planning
     """
-    places = load_places()
-    
-    # Filter by city (case-insensitive)
-    matching_places = [
-        p for p in places
-        if p["city"].lower() == city.lower()
-    ]
+    # Look up the city (case-insensitive); the indexed list is shared, never mutate it
+    matching_places = _places_by_city().get(city.casefold(), ())
     
     if not matching_places:
         return {
@@ -68,14 +116,14 @@ def search_places(
     
     # Filter by place types
     if place_types:
-        type_set = set(t.lower() for t in place_types)
+        type_set = _norm_set(tuple(place_types))
         matching_places = [
             p for p in matching_places
-            if p["type"].lower() in type_set
+            if p.type_key in type_set
         ]
     
     # Filter by minimum rating
-    matching_places = [p for p in matching_places if p["rating"] >= min_rating]
+    matching_places = [p for p in matching_places if p.rating >= min_rating]
     
     if not matching_places:
         return {
@@ -85,40 +133,24 @@ def search_places(
             "reasoning": "Try lowering the rating threshold or including more place types."
         }
     
-    # Sort by rating (highest first)
-    matching_places.sort(key=lambda x: x["rating"], reverse=True)
-    
-    # Get top results
-    top_places = matching_places[:max_results]
+    # Top results by rating (highest first; partial sort, stable like sorted())
+    top_places = heapq.nlargest(max_results, matching_places, key=lambda x: x.rating)
     
     # Format results
-    formatted_places = []
-    for i, p in enumerate(top_places):
-        formatted_places.append({
-            "rank": i + 1,
-            "place_id": p["place_id"],
-            "name": p["name"],
-            "city": p["city"],
-            "type": p["type"],
-            "type_emoji": get_type_emoji(p["type"]),
-            "rating": p["rating"],
-            "rating_display": f"{'⭐' * int(p['rating'])} ({p['rating']})"
-        })
+    formatted_places = [{"rank": i, **p.emit} for i, p in enumerate(top_places, 1)]
     
     # Group places for day-wise planning (2-3 places per day)
-    places_per_day = 3
-    day_wise_plan = []
-    for i in range(0, len(formatted_places), places_per_day):
-        day_num = (i // places_per_day) + 1
-        day_places = formatted_places[i:i + places_per_day]
-        day_wise_plan.append({
+    day_wise_plan = [
+        {
             "day": day_num,
-            "places": day_places,
-            "place_names": [p["name"] for p in day_places]
-        })
+            "places": formatted_places[start:end],
+            "place_names": [formatted_places[i]["name"] for i in range(start, end)]
+        }
+        for day_num, (start, end) in enumerate(_day_chunks(len(formatted_places)), 1)
+    ]
     
-    # Get unique types found
-    types_found = list(set(p["type"] for p in top_places))
+    # Get unique types found, in rating order
+    types_found = list(dict.fromkeys(p.type for p in top_places))
     
     return {
         "success": True,
@@ -132,19 +164,33 @@ def search_places(
     }
 
 
+_TYPE_EMOJI = {
+    "beach": "🏖️",
+    "temple": "🛕",
+    "fort": "🏰",
+    "museum": "🏛️",
+    "park": "🌳",
+    "market": "🛒",
+    "lake": "🌊",
+    "monument": "🗿"
+}
+
+
 def get_type_emoji(place_type: str) -> str:
     """Get emoji for place type"""
-    emoji_map = {
-        "beach": "🏖️",
-        "temple": "🛕",
-        "fort": "🏰",
-        "museum": "🏛️",
-        "park": "🌳",
-        "market": "🛒",
-        "lake": "🌊",
-        "monument": "🗿"
-    }
-    return emoji_map.get(place_type.lower(), "📍")
+    return _TYPE_EMOJI.get(place_type.lower(), "📍")
+
+
+@lru_cache(maxsize=256)
+def _places_search_json(
+    city: str,
+    place_types: Optional[tuple],
+    min_rating: float,
+    max_results: int
+) -> str:
+    """Serialized search_places result; the dataset is static, so repeat queries reuse it"""
+    result = search_places(city, place_types, min_rating, max_results)
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
 
 
 @tool(args_schema=PlacesSearchInput)
@@ -158,5 +204,5 @@ def PlacesDiscoveryTool(
     Discover places and attractions in a city. Returns places sorted by rating with day-wise grouping.
     Use this tool when you need to find tourist attractions for itinerary planning.
     """
-    result = search_places(city, place_types, min_rating, max_results)
-    return json.dumps(result, indent=2)
+    types = tuple(place_types) if place_types is not None else None
+    return _places_search_json(city, types, min_rating, max_results)
@@ -3,19 +3,72 @@ Weather Lookup Tool for AI Travel Agent
 Uses Open-Meteo API (free, no API key required) to get weather forecasts
 """
 
+import asyncio
+import copy
 import json
+import re
+import threading
+import time
 import requests
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, List, Optional
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from config import CITY_COORDINATES, OPEN_METEO_API_URL
 
 
+# Shared HTTP session: keep-alive connections are reused across forecast calls
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    # Retry refused connections and gateway errors only; a read timeout is not
+    # retried, so a stalled API falls back after one timeout instead of three
+    max_retries=Retry(total=2, connect=2, read=0, status=2, backoff_factor=0.2,
+                      status_forcelist=[502, 503, 504])
+))
+_SESSION.headers.update({"Accept-Encoding": "gzip", "Connection": "keep-alive"})
+
+# Forecasts are reused for FORECAST_TTL_SECONDS, or the API's Cache-Control max-age if given
+FORECAST_TTL_SECONDS = 900
+FORECAST_CACHE_SIZE = 256
+_forecast_cache = {}  # (city, start_date, num_days) -> (expires_at, result)
+_forecast_cache_lock = threading.Lock()
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+# Lowercased city -> (configured name, coordinates)
+_CITY_COORDS_LC = {k.lower(): (k, v) for k, v in CITY_COORDINATES.items()}
+
+
+def _cached_forecast(key: tuple) -> Optional[dict]:
+    """Return a copy of a still-fresh cached forecast, or None"""
+    with _forecast_cache_lock:
+        entry = _forecast_cache.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return copy.deepcopy(entry[1])
+
+
+def _store_forecast(key: tuple, result: dict, cache_control: Optional[str]) -> None:
+    """Cache a live forecast for its max-age (or the default TTL)"""
+    match = _MAX_AGE.search(cache_control or "")
+    ttl = int(match.group(1)) if match else FORECAST_TTL_SECONDS
+    if ttl <= 0:
+        return
+    now = time.monotonic()
+    with _forecast_cache_lock:
+        if len(_forecast_cache) >= FORECAST_CACHE_SIZE:
+            # Drop expired entries, then the oldest ones
+            for k in [k for k, (expires, _) in _forecast_cache.items() if expires <= now]:
+                del _forecast_cache[k]
+            while len(_forecast_cache) >= FORECAST_CACHE_SIZE:
+                del _forecast_cache[next(iter(_forecast_cache))]
+        _forecast_cache[key] = (now + ttl, copy.deepcopy(result))
+
+
 class WeatherLookupInput(BaseModel):
     """Input schema for weather lookup"""
     city: str = Field(description="City to get weather for (e.g., 'Goa', 'Delhi')")
@@ -23,35 +76,38 @@ class WeatherLookupInput(BaseModel):
     num_days: int = Field(default=3, description="Number of days to forecast (1-14)")
 
 
+# WMO weather code -> (description, emoji)
+_WEATHER_CODES = {
+    0: ("Clear sky", "☀️"),
+    1: ("Mainly clear", "🌤️"),
+    2: ("Partly cloudy", "⛅"),
+    3: ("Overcast", "☁️"),
+    45: ("Foggy", "🌫️"),
+    48: ("Depositing rime fog", "🌫️"),
+    51: ("Light drizzle", "🌧️"),
+    53: ("Moderate drizzle", "🌧️"),
+    55: ("Dense drizzle", "🌧️"),
+    61: ("Slight rain", "🌧️"),
+    63: ("Moderate rain", "🌧️"),
+    65: ("Heavy rain", "🌧️"),
+    71: ("Slight snow", "🌨️"),
+    73: ("Moderate snow", "🌨️"),
+    75: ("Heavy snow", "🌨️"),
+    77: ("Snow grains", "🌨️"),
+    80: ("Slight rain showers", "🌦️"),
+    81: ("Moderate rain showers", "🌦️"),
+    82: ("Violent rain showers", "⛈️"),
+    85: ("Slight snow showers", "🌨️"),
+    86: ("Heavy snow showers", "🌨️"),
+    95: ("Thunderstorm", "⛈️"),
+    96: ("Thunderstorm with slight hail", "⛈️"),
+    99: ("Thunderstorm with heavy hail", "⛈️"),
+}
+
+
 def get_weather_code_description(code: int) -> tuple:
     """Convert WMO weather code to description and emoji"""
-    weather_codes = {
-        0: ("Clear sky", "☀️"),
-        1: ("Mainly clear", "🌤️"),
-        2: ("Partly cloudy", "⛅"),
-        3: ("Overcast", "☁️"),
-        45: ("Foggy", "🌫️"),
-        48: ("Depositing rime fog", "🌫️"),
-        51: ("Light drizzle", "🌧️"),
-        53: ("Moderate drizzle", "🌧️"),
-        55: ("Dense drizzle", "🌧️"),
-        61: ("Slight rain", "🌧️"),
-        63: ("Moderate rain", "🌧️"),
-        65: ("Heavy rain", "🌧️"),
-        71: ("Slight snow", "🌨️"),
-        73: ("Moderate snow", "🌨️"),
-        75: ("Heavy snow", "🌨️"),
-        77: ("Snow grains", "🌨️"),
-        80: ("Slight rain showers", "🌦️"),
-        81: ("Moderate rain showers", "🌦️"),
-        82: ("Violent rain showers", "⛈️"),
-        85: ("Slight snow showers", "🌨️"),
-        86: ("Heavy snow showers", "🌨️"),
-        95: ("Thunderstorm", "⛈️"),
-        96: ("Thunderstorm with slight hail", "⛈️"),
-        99: ("Thunderstorm with heavy hail", "⛈️"),
-    }
-    return weather_codes.get(code, ("Unknown", "🌡️"))
+    return _WEATHER_CODES.get(code, ("Unknown", "🌡️"))
 
 
 def get_weather(
@@ -70,34 +126,92 @@ def get_weather(
     Returns:
         Dictionary with weather data for each day
     """
-    # Get city coordinates
-    city_title = city.title()
-    if city_title not in CITY_COORDINATES:
-        return {
-            "success": False,
-            "message": f"City '{city}' not found in database",
-            "available_cities": list(CITY_COORDINATES.keys()),
-            "forecast": []
-        }
+    return get_weather_batch([city], start_date, num_days)[city]
+
+
+async def get_weather_async(
+    city: str,
+    start_date: str,
+    num_days: int = 3
+) -> dict:
+    """
+    Async variant of get_weather for callers on an event loop.
+    
+    The lookup runs in a worker thread on the shared pooled session (and
+    forecast cache), so several cities can be awaited together with
+    asyncio.gather without blocking the loop.
+    """
+    return await asyncio.to_thread(get_weather, city, start_date, num_days)
+
+
+def get_weather_batch(
+    cities: List[str],
+    start_date: str,
+    num_days: int = 3
+) -> Dict[str, dict]:
+    """
+    Get weather forecasts for several cities over the same date range.
     
-    coords = CITY_COORDINATES[city_title]
+    Cities that are not already cached are fetched in a single Open-Meteo
+    request (comma-separated coordinates).
     
-    # Calculate end date
+    Args:
+        cities: City names
+        start_date: Start date (YYYY-MM-DD)
+        num_days: Number of days to forecast
+        
+    Returns:
+        Dictionary mapping each given city name to its get_weather result
+    """
+    results = {}
+    to_fetch = {}  # configured city name -> names it was requested as
+    for city in cities:
+        if city in results:
+            continue
+        # Get city coordinates
+        entry = _CITY_COORDS_LC.get(city.lower())
+        if entry is None:
+            results[city] = {
+                "success": False,
+                "message": f"City '{city}' not found in database",
+                "available_cities": list(CITY_COORDINATES.keys()),
+                "forecast": []
+            }
+            continue
+        city_title = entry[0]
+        cached = _cached_forecast((city_title, start_date, num_days))
+        if cached is not None:
+            results[city] = cached
+        else:
+            to_fetch.setdefault(city_title, []).append(city)
+            results[city] = None  # filled in below, keeps the input order
+    
+    if not to_fetch:
+        return results
+    
+    # Calculate end date (fromisoformat is the fast path for YYYY-MM-DD)
     try:
-        start = datetime.strptime(start_date, "%Y-%m-%d")
+        if len(start_date) == 10 and start_date[4] == "-" and start_date[7] == "-":
+            start = datetime.fromisoformat(start_date)
+        else:
+            start = datetime.strptime(start_date, "%Y-%m-%d")
         end = start + timedelta(days=num_days - 1)
         end_date = end.strftime("%Y-%m-%d")
     except ValueError:
-        return {
-            "success": False,
-            "message": "Invalid date format. Use YYYY-MM-DD",
-            "forecast": []
-        }
+        for names in to_fetch.values():
+            for city in names:
+                results[city] = {
+                    "success": False,
+                    "message": "Invalid date format. Use YYYY-MM-DD",
+                    "forecast": []
+                }
+        return results
     
     # Make API request
+    titles = list(to_fetch)
     params = {
-        "latitude": coords["lat"],
-        "longitude": coords["lon"],
+        "latitude": ",".join(str(CITY_COORDINATES[t]["lat"]) for t in titles),
+        "longitude": ",".join(str(CITY_COORDINATES[t]["lon"]) for t in titles),
         "daily": ["weather_code", "temperature_2m_max", "temperature_2m_min", "precipitation_probability_max"],
         "start_date": start_date,
         "end_date": end_date,
@@ -105,51 +219,90 @@ def get_weather(
     }
     
     try:
-        response = requests.get(OPEN_METEO_API_URL, params=params, timeout=10)
+        response = _SESSION.get(OPEN_METEO_API_URL, params=params, timeout=(3.05, 10))
         response.raise_for_status()
         data = response.json()
     except requests.RequestException as e:
-        # Return mock data if API fails (for development/demo)
-        return get_mock_weather(city, start_date, num_days)
+        data = None
     
-    # Parse response
+    # One location comes back as an object, several as a list in request order
+    locations = data if isinstance(data, list) else [data]
+    if data is None or len(locations) != len(titles):
+        # Return mock data if API fails (for development/demo); a response without
+        # one location per requested city can't be matched up, so it counts as failed
+        for names in to_fetch.values():
+            for city in names:
+                results[city] = get_mock_weather(city, start_date, num_days)
+        return results
+    cache_control = response.headers.get("Cache-Control")
+    for city_title, location in zip(titles, locations):
+        result = _parse_forecast(city_title, start_date, end_date, num_days, location)
+        # Only live forecasts are cached; errors and the mock fallback are retried next call
+        _store_forecast((city_title, start_date, num_days), result, cache_control)
+        first, *others = to_fetch[city_title]
+        results[first] = result
+        for city in others:
+            results[city] = copy.deepcopy(result)
+    return results
+
+
+def _column(daily: dict, key: str, n: int, default) -> list:
+    """First n values of a daily column, padded with default if it is short"""
+    values = daily.get(key, [])[:n]
+    return values + [default] * (n - len(values))
+
+
+def _parse_forecast(
+    city_title: str,
+    start_date: str,
+    end_date: str,
+    num_days: int,
+    data: dict
+) -> dict:
+    """Build a get_weather result from one location of an Open-Meteo response"""
+    # Parse response; a short column is padded with its default
     daily = data.get("daily", {})
     dates = daily.get("time", [])
-    weather_codes = daily.get("weather_code", [])
-    max_temps = daily.get("temperature_2m_max", [])
-    min_temps = daily.get("temperature_2m_min", [])
-    precipitation = daily.get("precipitation_probability_max", [])
+    n = len(dates)
+    max_temps = _column(daily, "temperature_2m_max", n, 30)
+    rows = zip(
+        dates,
+        _column(daily, "weather_code", n, 0),
+        max_temps,
+        _column(daily, "temperature_2m_min", n, 20),
+        _column(daily, "precipitation_probability_max", n, 0)
+    )
     
-    forecast = []
-    for i, date in enumerate(dates):
-        code = weather_codes[i] if i < len(weather_codes) else 0
-        description, emoji = get_weather_code_description(code)
-        
-        forecast.append({
-            "day": i + 1,
+    forecast = [
+        {
+            "day": i,
             "date": date,
             "condition": description,
             "emoji": emoji,
-            "temperature_max": max_temps[i] if i < len(max_temps) else 30,
-            "temperature_min": min_temps[i] if i < len(min_temps) else 20,
-            "temperature_display": f"{max_temps[i] if i < len(max_temps) else 30}°C / {min_temps[i] if i < len(min_temps) else 20}°C",
-            "precipitation_chance": precipitation[i] if i < len(precipitation) else 0
-        })
+            "temperature_max": t_max,
+            "temperature_min": t_min,
+            "temperature_display": f"{t_max}°C / {t_min}°C",
+            "precipitation_chance": precipitation
+        }
+        for i, (date, code, t_max, t_min, precipitation) in enumerate(rows, 1)
+        for description, emoji in (get_weather_code_description(code),)
+    ]
     
-    # Generate weather summary
-    avg_max = sum(f["temperature_max"] for f in forecast) / len(forecast) if forecast else 30
-    conditions = [f["condition"] for f in forecast]
+    # Generate weather summary; conditions are listed once each, in date order
+    avg_max = sum(max_temps) / n if n else 30
+    conditions = dict.fromkeys(f["condition"] for f in forecast)
     
-    return {
+    result = {
         "success": True,
         "city": city_title,
         "start_date": start_date,
         "end_date": end_date,
         "num_days": num_days,
         "forecast": forecast,
-        "summary": f"Average high of {avg_max:.1f}°C. Conditions: {', '.join(set(conditions))}.",
+        "summary": f"Average high of {avg_max:.1f}°C. Conditions: {', '.join(conditions)}.",
         "recommendations": get_weather_recommendations(forecast)
     }
+    return result
 
 
 def get_mock_weather(city: str, start_date: str, num_days: int) -> dict:
@@ -199,16 +352,27 @@ def get_weather_recommendations(forecast: list) -> list:
     """Generate packing/activity recommendations based on weather"""
     recommendations = []
     
-    max_temps = [f["temperature_max"] for f in forecast]
-    conditions = [f["condition"].lower() for f in forecast]
+    # One pass over the forecast, noting which kinds of days it contains
+    hot = cold = rainy = sunny = False
+    for f in forecast:
+        t = f["temperature_max"]
+        c = f["condition"].lower()
+        if t > 30:
+            hot = True
+        if t < 20:
+            cold = True
+        if "rain" in c:
+            rainy = True
+        if "clear" in c or "sunny" in c:
+            sunny = True
     
-    if any(t > 30 for t in max_temps):
+    if hot:
         recommendations.append("🧴 Pack sunscreen and stay hydrated")
-    if any(t < 20 for t in max_temps):
+    if cold:
         recommendations.append("🧥 Bring a light jacket for cooler evenings")
-    if any("rain" in c for c in conditions):
+    if rainy:
         recommendations.append("☔ Pack an umbrella or rain jacket")
-    if any("clear" in c or "sunny" in c for c in conditions):
+    if sunny:
         recommendations.append("🕶️ Great weather for outdoor activities!")
     
     if not recommendations:
@@ -229,4 +393,4 @@ def WeatherLookupTool(
     Use this tool to check weather conditions for travel planning.
     """
     result = get_weather(city, start_date, num_days)
-    return json.dumps(result, indent=2)
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
@@ -2,8 +2,19 @@
 Helper functions for AI Travel Agent
 """
 
-from datetime import datetime, timedelta
-from typing import Tuple, Optional
+import io
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Tuple, Optional
+
+
+_DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%Y/%m/%d")
+
+
+def _is_iso_date(date_str: str) -> bool:
+    """Check for the YYYY-MM-DD shape that fromisoformat can parse."""
+    return len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-"
 
 
 def format_currency(amount: int, currency: str = "INR") -> str:
@@ -13,10 +24,14 @@ def format_currency(amount: int, currency: str = "INR") -> str:
     return f"{amount:,} {currency}"
 
 
+@lru_cache(maxsize=256)
 def format_date(date_str: str, output_format: str = "%b %d, %Y") -> str:
     """Format date string to human-readable format."""
     try:
-        date = datetime.strptime(date_str, "%Y-%m-%d")
+        if _is_iso_date(date_str):
+            date = datetime.fromisoformat(date_str)
+        else:
+            date = datetime.strptime(date_str, "%Y-%m-%d")
         return date.strftime(output_format)
     except ValueError:
         return date_str
@@ -24,8 +39,12 @@ def format_date(date_str: str, output_format: str = "%b %d, %Y") -> str:
 
 def parse_date(date_str: str) -> Optional[datetime]:
     """Parse date string to datetime object."""
-    formats = ["%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%Y/%m/%d"]
-    for fmt in formats:
+    if _is_iso_date(date_str):
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
+    for fmt in _DATE_FORMATS:
         try:
             return datetime.strptime(date_str, fmt)
         except ValueError:
@@ -33,6 +52,17 @@ def parse_date(date_str: str) -> Optional[datetime]:
     return None
 
 
+@lru_cache(maxsize=1)
+def _midnight_for_minute(minute: int) -> datetime:
+    """Today's midnight, computed once per wall-clock minute."""
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _today_cached() -> datetime:
+    """Today's midnight; may lag the date change by up to a minute."""
+    return _midnight_for_minute(int(time.time() // 60))
+
+
 def validate_date_range(start_date: str, num_days: int) -> Tuple[bool, str]:
     """
     Validate that date range is acceptable.
@@ -44,14 +74,16 @@ def validate_date_range(start_date: str, num_days: int) -> Tuple[bool, str]:
     if not start:
         return False, "Invalid date format. Use YYYY-MM-DD"
     
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    # Compare whole days as ordinals (parsed dates are always at midnight)
+    start_day = start.toordinal()
+    today = _today_cached().toordinal()
     
     # Check if date is not too far in past
-    if start < today - timedelta(days=1):
+    if start_day < today - 1:
         return False, "Start date cannot be in the past"
     
     # Check if date is not too far in future (weather API limit)
-    if start > today + timedelta(days=365):
+    if start_day > today + 365:
         return False, "Start date cannot be more than 1 year in advance"
     
     # Check number of days
@@ -64,6 +96,7 @@ def validate_date_range(start_date: str, num_days: int) -> Tuple[bool, str]:
     return True, ""
 
 
+@lru_cache(maxsize=64)
 def get_city_emoji(city: str) -> str:
     """Get emoji representing a city."""
     city_emojis = {
@@ -91,15 +124,20 @@ def calculate_trip_stats(trip_plan: dict) -> dict:
     # Count activities
     total_activities = sum(len(day.get("activities", [])) for day in itinerary)
     
-    # Count place types
-    place_types = {}
+    # Count place types and sum ratings in one pass
+    place_types: Dict[str, int] = {}
+    rating_sum = 0.0
+    rating_count = 0
     for place in places:
         ptype = place.get("type", "other")
         place_types[ptype] = place_types.get(ptype, 0) + 1
+        rating = place.get("rating")
+        if rating:
+            rating_sum += rating
+            rating_count += 1
     
     # Average rating of places
-    ratings = [p.get("rating", 0) for p in places if p.get("rating")]
-    avg_rating = sum(ratings) / len(ratings) if ratings else 0
+    avg_rating = rating_sum / rating_count if rating_count else 0
     
     return {
         "total_activities": total_activities,
@@ -115,52 +153,51 @@ def format_itinerary_for_export(trip_plan: dict) -> str:
     if not trip_plan.get("success"):
         return "Trip planning failed"
     
-    lines = []
+    buf = io.StringIO()
+    w = buf.write
     summary = trip_plan["trip_summary"]
     
-    lines.append("=" * 50)
-    lines.append(summary["title"].upper())
-    lines.append("=" * 50)
-    lines.append(f"From: {summary['from']} → To: {summary['to']}")
-    lines.append(f"Dates: {summary['dates']}")
-    lines.append(f"Travelers: {summary['travelers']}")
-    lines.append("")
+    w("=" * 50 + "\n")
+    w(summary["title"].upper() + "\n")
+    w("=" * 50 + "\n")
+    w(f"From: {summary['from']} → To: {summary['to']}\n")
+    w(f"Dates: {summary['dates']}\n")
+    w(f"Travelers: {summary['travelers']}\n")
+    w("\n")
     
     # Flight
     flight = trip_plan["flight"]
-    lines.append("FLIGHT DETAILS")
-    lines.append("-" * 30)
-    lines.append(f"Airline: {flight['airline']}")
-    lines.append(f"Departure: {flight['departure']}")
-    lines.append(f"Price: {flight['price_formatted']}")
-    lines.append("")
+    w("FLIGHT DETAILS\n")
+    w("-" * 30 + "\n")
+    w(f"Airline: {flight['airline']}\n")
+    w(f"Departure: {flight['departure']}\n")
+    w(f"Price: {flight['price_formatted']}\n")
+    w("\n")
     
     # Hotel
     hotel = trip_plan["hotel"]
-    lines.append("HOTEL DETAILS")
-    lines.append("-" * 30)
-    lines.append(f"Name: {hotel['name']}")
-    lines.append(f"Rating: {'⭐' * hotel['stars']}")
-    lines.append(f"Price: {hotel['price_formatted']}")
-    lines.append(f"Amenities: {', '.join(hotel['amenities'])}")
-    lines.append("")
+    w("HOTEL DETAILS\n")
+    w("-" * 30 + "\n")
+    w(f"Name: {hotel['name']}\n")
+    w(f"Rating: {'⭐' * hotel['stars']}\n")
+    w(f"Price: {hotel['price_formatted']}\n")
+    w(f"Amenities: {', '.join(hotel['amenities'])}\n")
+    w("\n")
     
     # Itinerary
-    lines.append("DAILY ITINERARY")
-    lines.append("-" * 30)
+    w("DAILY ITINERARY\n")
+    w("-" * 30 + "\n")
     for day in trip_plan["itinerary"]:
-        lines.append(f"\nDay {day['day']} - {day['date_display']}")
-        lines.append(f"Weather: {day['weather_display']}")
-        for activity in day["activities"]:
-            lines.append(f"  • {activity}")
-    lines.append("")
+        w(f"\nDay {day['day']} - {day['date_display']}\n")
+        w(f"Weather: {day['weather_display']}\n")
+        w("".join(f"  • {activity}\n" for activity in day["activities"]))
+    w("\n")
     
     # Budget
     budget = trip_plan["budget"]
-    lines.append("BUDGET BREAKDOWN")
-    lines.append("-" * 30)
-    lines.append(f"Total: {budget['total_formatted']}")
-    lines.append(f"Per Person: {budget['per_person_formatted']}")
-    lines.append("")
+    w("BUDGET BREAKDOWN\n")
+    w("-" * 30 + "\n")
+    w(f"Total: {budget['total_formatted']}\n")
+    w(f"Per Person: {budget['per_person_formatted']}\n")
     
-    return "\n".join(lines)
+    return buf.getvalue()
@@ -4,52 +4,65 @@ Parses natural language travel queries with fuzzy matching and proper memory
 """
 
 import re
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Set, Tuple
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from config import AVAILABLE_CITIES
+from config import AVAILABLE_CITIES, AVAILABLE_CITIES_TEXT
 
+# Lowercased city names, their canonical spelling, and their character sets for _similar
+AVAILABLE_CITIES_LOWER = [c.lower() for c in AVAILABLE_CITIES]
+CITY_MAP = dict(zip(AVAILABLE_CITIES_LOWER, AVAILABLE_CITIES))
+_CITY_CHARS = {c: frozenset(c) for c in AVAILABLE_CITIES_LOWER}
 
+# Common misspellings and variations
+_CITY_ALIASES = {
+    'hyderabad': ['hyderbad', 'hydrabad', 'hyd', 'hybd', 'hyderbad'],
+    'bangalore': ['bengaluru', 'banglore', 'blr', 'blore', 'bangaluru'],
+    'mumbai': ['bombay', 'mum', 'mumbay'],
+    'delhi': ['new delhi', 'newdelhi', 'del', 'dilli'],
+    'kolkata': ['calcutta', 'kolkatta', 'kolkta', 'kol'],
+    'chennai': ['madras', 'chenai', 'chennay'],
+    'goa': ['gova', 'panaji'],
+    'jaipur': ['jpir', 'jaypur', 'jaipr']
+}
+
+# Exact spellings and aliases -> city, so known names resolve with one dict lookup
+_ALIAS_TO_CITY = {
+    alias: city.title()
+    for city, aliases in _CITY_ALIASES.items()
+    for alias in (city, *aliases)
+}
+_ALIAS_TO_CITY.update(CITY_MAP)  # exact city names take precedence
+_CITY_TOKEN_SET = frozenset(_ALIAS_TO_CITY)
+
+
+@lru_cache(maxsize=1024)
 def fuzzy_match_city(input_str: str) -> Optional[str]:
     """
     Fuzzy match city name to handle misspellings.
     Uses simple edit distance and common misspellings.
+    Results (including misses) are memoized per input string.
     """
     input_lower = input_str.lower().strip()
     
-    # Direct match
-    for city in AVAILABLE_CITIES:
-        if city.lower() == input_lower:
-            return city
-    
-    # Common misspellings and variations
-    city_aliases = {
-        'hyderabad': ['hyderbad', 'hydrabad', 'hyd', 'hybd', 'hyderbad'],
-        'bangalore': ['bengaluru', 'banglore', 'blr', 'blore', 'bangaluru'],
-        'mumbai': ['bombay', 'mum', 'mumbay'],
-        'delhi': ['new delhi', 'newdelhi', 'del', 'dilli'],
-        'kolkata': ['calcutta', 'kolkatta', 'kolkta', 'kol'],
-        'chennai': ['madras', 'chenai', 'chennay'],
-        'goa': ['gova', 'panaji'],
-        'jaipur': ['jpir', 'jaypur', 'jaipr']
-    }
-    
-    for city, aliases in city_aliases.items():
-        if input_lower in aliases or input_lower == city:
-            return city.title()
+    # Direct match, common misspellings and variations
+    alias_match = _ALIAS_TO_CITY.get(input_lower)
+    if alias_match:
+        return alias_match
     
     # Substring match
-    for city in AVAILABLE_CITIES:
-        if input_lower in city.lower() or city.lower() in input_lower:
-            return city
+    for city in AVAILABLE_CITIES_LOWER:
+        if input_lower in city or city in input_lower:
+            return CITY_MAP[city]
     
     # Levenshtein-like matching for small errors
-    for city in AVAILABLE_CITIES:
-        if _similar(input_lower, city.lower()):
-            return city
+    for city in AVAILABLE_CITIES_LOWER:
+        if _similar(input_lower, city):
+            return CITY_MAP[city]
     
     return None
 
@@ -59,8 +72,9 @@ def _similar(a: str, b: str, threshold: float = 0.7) -> bool:
     if len(a) < 3 or len(b) < 3:
         return False
     
-    # Count matching characters
-    matches = sum(1 for c in a if c in b)
+    # Count matching characters (set membership; city charsets are precomputed)
+    b_chars = _CITY_CHARS.get(b) or frozenset(b)
+    matches = sum(1 for c in a if c in b_chars)
     ratio = matches / max(len(a), len(b))
     return ratio >= threshold
 
@@ -70,31 +84,57 @@ class QueryParser:
     Parses natural language travel queries with memory support.
     """
     
-    def __init__(self):
-        self.cities = [c.lower() for c in AVAILABLE_CITIES]
-        self.city_map = {c.lower(): c for c in AVAILABLE_CITIES}
-        
-        self.number_words = {
-            'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
-            'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
-            'a': 1, 'an': 1
-        }
-        
-        self.budget_keywords = {
-            'cheap': 'budget', 'budget': 'budget', 'affordable': 'budget', 
-            'low cost': 'budget', 'economy': 'budget', 'economical': 'budget',
-            'under': 'budget',  # "under 20k" implies budget conscious
-            'balanced': 'balanced', 'moderate': 'balanced', 'mid-range': 'balanced',
-            'luxury': 'premium', 'premium': 'premium', 'expensive': 'premium',
-            'high-end': 'premium', '5 star': 'premium', 'five star': 'premium'
-        }
-        
-        # Memory for conversation context
-        self.memory = {}
+    # Lookup tables are static, so they live on the class and are shared by every parser
+    cities = AVAILABLE_CITIES_LOWER
+    city_map = CITY_MAP
+    
+    number_words = {
+        'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+        'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
+        'a': 1, 'an': 1
+    }
     
-    def parse_query(self, query: str, existing_context: Dict = None) -> Dict[str, Any]:
+    # All spelled-out counts before "days"/"nights" in one alternation (longest
+    # words first so "an" wins over "a"), instead of one regex search per word
+    _RE_WORD_DAYS = re.compile(
+        r'\b(' + '|'.join(sorted(number_words, key=len, reverse=True)) + r')\s*(?:days?|nights?)'
+    )
+    
+    budget_keywords = {
+        'cheap': 'budget', 'budget': 'budget', 'affordable': 'budget', 
+        'low cost': 'budget', 'economy': 'budget', 'economical': 'budget',
+        'under': 'budget',  # "under 20k" implies budget conscious
+        'balanced': 'balanced', 'moderate': 'balanced', 'mid-range': 'balanced',
+        'luxury': 'premium', 'premium': 'premium', 'expensive': 'premium',
+        'high-end': 'premium', '5 star': 'premium', 'five star': 'premium'
+    }
+    
+    # Every budget keyword occurring in the query, found in a single scan. The
+    # lookahead reports overlapping occurrences too, so this sees exactly what
+    # one `keyword in query` check per keyword would.
+    _RE_BUDGET_KEYWORDS = re.compile(
+        '(?=(' + '|'.join(re.escape(k) for k in sorted(budget_keywords, key=len, reverse=True)) + '))'
+    )
+    
+    # Extraction patterns, compiled once
+    _RE_FROM_TO = re.compile(r'from\s+(\w+)\s+to\s+(\w+)')
+    _RE_TO = re.compile(r'(\w+)\s+to\s+(\w+)')
+    _RE_TO_ONLY = re.compile(r'\bto\s+(\w+)')
+    _RE_FROM_ONLY = re.compile(r'from\s+(\w+)')
+    _RE_VISIT = re.compile(r'(?:visiting|visit|trip to|travel to|going to)\s+(\w+)')
+    _RE_DAYS = re.compile(r'(\d+)\s*(?:days?|nights?)')
+    _RE_TRAVELERS = re.compile(r'(\d+)\s*(?:people|persons?|travelers?|adults?)')
+    _RE_BUDGET_KEYWORD = re.compile(r'(?:under|within|budget|max|upto|up to)\s*(?:rs\.?|₹|inr)?\s*(\d+)\s*(k|K|thousand)?')
+    _RE_BUDGET_AMOUNT = re.compile(r'(?:rs\.?|₹|inr)?\s*(\d+)\s*(k|K|thousand)?(?:\s*budget)?')
+    _RE_WORD = re.compile(r"[a-z]+")
+    _RE_STARS = re.compile(r'(\d+)\s*star')
+    # Relative start dates, as days from today
+    _DATE_OFFSETS = (('tomorrow', 1), ('next week', 7), ('next month', 30))
+    
+    def parse_query(self, query: str, existing_context: Optional[Dict] = None) -> Dict[str, Any]:
         """Parse query with context from previous messages."""
         query_lower = query.lower().strip()
+        now = datetime.now()  # one clock read per parse
         
         # Start with existing context or fresh
         result = {
@@ -131,11 +171,11 @@ class QueryParser:
         if new_days:
             result['num_days'] = new_days
         
-        new_date = self._extract_date(query_lower)
+        new_date = self._extract_date(query_lower, now)
         if new_date:
             result['start_date'] = new_date
         elif not result['start_date']:
-            result['start_date'] = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+            result['start_date'] = (now + timedelta(days=7)).strftime("%Y-%m-%d")
         
         new_travelers = self._extract_travelers(query_lower)
         if new_travelers:
@@ -147,16 +187,17 @@ class QueryParser:
             result['max_budget'] = new_budget
             result['budget_preference'] = 'budget'  # If they specify max budget, they're budget conscious
         
-        budget_pref = self._extract_budget_preference(query_lower)
+        keywords = {m.group(1) for m in self._RE_BUDGET_KEYWORDS.finditer(query_lower)}
+        budget_pref = self._extract_budget_preference(keywords)
         if budget_pref != 'balanced':
             result['budget_preference'] = budget_pref
         
-        stars = self._extract_hotel_stars(query_lower)
+        stars = self._extract_hotel_stars(query_lower, keywords)
         if stars != 3:
             result['min_hotel_stars'] = stars
         
         # Determine missing fields
-        missing = []
+        missing: List[str] = []
         if not result['source']:
             missing.append('source city')
         if not result['destination']:
@@ -177,18 +218,18 @@ class QueryParser:
     
     def _extract_cities(self, query: str) -> Tuple[Optional[str], Optional[str]]:
         """Extract source and destination with fuzzy matching."""
-        source = None
-        destination = None
+        source: Optional[str] = None
+        destination: Optional[str] = None
         
         # Pattern: "from X to Y"
-        from_to_match = re.search(r'from\s+(\w+)\s+to\s+(\w+)', query)
+        from_to_match = self._RE_FROM_TO.search(query)
         if from_to_match:
             source = fuzzy_match_city(from_to_match.group(1))
             destination = fuzzy_match_city(from_to_match.group(2))
             return source, destination
         
         # Pattern: "X to Y" (without 'from')
-        to_match = re.search(r'(\w+)\s+to\s+(\w+)', query)
+        to_match = self._RE_TO.search(query)
         if to_match:
             src = fuzzy_match_city(to_match.group(1))
             dst = fuzzy_match_city(to_match.group(2))
@@ -198,43 +239,49 @@ class QueryParser:
                 destination = dst
         
         # Pattern: "to X" only
-        to_only = re.search(r'\bto\s+(\w+)', query)
+        to_only = self._RE_TO_ONLY.search(query)
         if to_only and not destination:
             destination = fuzzy_match_city(to_only.group(1))
         
         # Pattern: "from X" only (follow-up message)
-        from_only = re.search(r'from\s+(\w+)', query)
+        from_only = self._RE_FROM_ONLY.search(query)
         if from_only and not source:
             source = fuzzy_match_city(from_only.group(1))
         
         # Pattern: "visiting X" / "trip to X"
-        visit_match = re.search(r'(?:visiting|visit|trip to|travel to|going to)\s+(\w+)', query)
+        visit_match = self._RE_VISIT.search(query)
         if visit_match and not destination:
             destination = fuzzy_match_city(visit_match.group(1))
         
         # Try to find any city mentioned (for follow-up like "from hyderabad")
         if not source and not destination:
-            words = query.split()
-            for word in words:
-                matched = fuzzy_match_city(word)
-                if matched:
-                    # If context has destination but no source, this is source
-                    source = matched
+            # If context has destination but no source, this is source. The first
+            # word naming a city wins: exact names and aliases resolve with a set
+            # check, misspellings through fuzzy matching of longer words, so a
+            # one-word reply like "hyderbd" still resolves but "a"/"an" never do
+            for word in self._RE_WORD.findall(query):
+                if word in _CITY_TOKEN_SET:
+                    source = _ALIAS_TO_CITY[word]
                     break
+                if len(word) >= 3:
+                    matched = fuzzy_match_city(word)
+                    if matched:
+                        source = matched
+                        break
         
         return source, destination
     
     def _extract_days(self, query: str) -> Optional[int]:
         """Extract number of days."""
         # Pattern: "X days" or "X day"
-        match = re.search(r'(\d+)\s*(?:days?|nights?)', query)
+        match = self._RE_DAYS.search(query)
         if match:
             return min(max(int(match.group(1)), 1), 14)
         
         # Word numbers
-        for word, num in self.number_words.items():
-            if re.search(rf'\b{word}\s*(?:days?|nights?)', query):
-                return num
+        match = self._RE_WORD_DAYS.search(query)
+        if match:
+            return self.number_words[match.group(1)]
         
         # "a week"
         if 'week' in query and 'weekend' not in query:
@@ -244,22 +291,17 @@ class QueryParser:
         
         return None
     
-    def _extract_date(self, query: str) -> Optional[str]:
-        """Extract start date."""
-        today = datetime.now()
-        
-        if 'tomorrow' in query:
-            return (today + timedelta(days=1)).strftime("%Y-%m-%d")
-        if 'next week' in query:
-            return (today + timedelta(days=7)).strftime("%Y-%m-%d")
-        if 'next month' in query:
-            return (today + timedelta(days=30)).strftime("%Y-%m-%d")
+    def _extract_date(self, query: str, today: datetime) -> Optional[str]:
+        """Extract start date relative to today."""
+        for keyword, days in self._DATE_OFFSETS:
+            if keyword in query:
+                return (today + timedelta(days=days)).strftime("%Y-%m-%d")
         
         return None
     
     def _extract_travelers(self, query: str) -> Optional[int]:
         """Extract number of travelers."""
-        match = re.search(r'(\d+)\s*(?:people|persons?|travelers?|adults?)', query)
+        match = self._RE_TRAVELERS.search(query)
         if match:
             return min(max(int(match.group(1)), 1), 10)
         
@@ -275,7 +317,7 @@ class QueryParser:
     def _extract_budget_amount(self, query: str) -> Optional[int]:
         """Extract budget amount like '20k' or '20000'."""
         # Pattern: "under 20k" or "budget 20000" or "within 15k"
-        match = re.search(r'(?:under|within|budget|max|upto|up to)\s*(?:rs\.?|₹|inr)?\s*(\d+)\s*(k|K|thousand)?', query)
+        match = self._RE_BUDGET_KEYWORD.search(query)
         if match:
             amount = int(match.group(1))
             if match.group(2) and match.group(2).lower() == 'k':
@@ -285,7 +327,7 @@ class QueryParser:
             return amount
         
         # Pattern: just "20k" or "₹20000"
-        match = re.search(r'(?:rs\.?|₹|inr)?\s*(\d+)\s*(k|K|thousand)?(?:\s*budget)?', query)
+        match = self._RE_BUDGET_AMOUNT.search(query)
         if match:
             amount = int(match.group(1))
             if match.group(2) and match.group(2).lower() == 'k':
@@ -298,29 +340,30 @@ class QueryParser:
         
         return None
     
-    def _extract_budget_preference(self, query: str) -> str:
-        """Extract budget preference."""
+    def _extract_budget_preference(self, keywords: Set[str]) -> str:
+        """Extract budget preference from the budget keywords found in the query."""
+        # First keyword in table order wins, as before
         for keyword, preference in self.budget_keywords.items():
-            if keyword in query:
+            if keyword in keywords:
                 return preference
         return 'balanced'
     
-    def _extract_hotel_stars(self, query: str) -> int:
+    def _extract_hotel_stars(self, query: str, keywords: Set[str]) -> int:
         """Extract hotel star preference."""
-        match = re.search(r'(\d+)\s*star', query)
+        match = self._RE_STARS.search(query)
         if match:
             return min(max(int(match.group(1)), 1), 5)
         
-        if 'luxury' in query or 'premium' in query:
+        if 'luxury' in keywords or 'premium' in keywords:
             return 5
-        if 'budget' in query or 'cheap' in query:
+        if 'budget' in keywords or 'cheap' in keywords:
             return 2
         
         return 3
     
     def _generate_missing_info_message(self, missing: List[str], result: Dict) -> str:
         """Generate friendly message for missing info."""
-        understood = []
+        understood: List[str] = []
         if result['source']:
             understood.append(f"from **{result['source']}**")
         if result['destination']:
@@ -336,12 +379,11 @@ class QueryParser:
         
         msg += "I just need:\n"
         
-        cities_list = ", ".join(AVAILABLE_CITIES)
         for field in missing:
             if 'source' in field:
-                msg += f"📍 **Where from?** ({cities_list})\n"
+                msg += f"📍 **Where from?** ({AVAILABLE_CITIES_TEXT})\n"
             elif 'destination' in field:
-                msg += f"🎯 **Where to?** ({cities_list})\n"
+                msg += f"🎯 **Where to?** ({AVAILABLE_CITIES_TEXT})\n"
             elif 'days' in field:
                 msg += f"📅 **How many days?**\n"
         
@@ -360,7 +402,10 @@ class QueryParser:
         )
 
 
-def parse_travel_query(query: str, context: Dict = None) -> Dict[str, Any]:
+# QueryParser keeps no per-call state (context is passed in), so one instance serves every call
+_PARSER_SINGLETON = QueryParser()
+
+
+def parse_travel_query(query: str, context: Optional[Dict] = None) -> Dict[str, Any]:
     """Convenience function."""
-    parser = QueryParser()
-    return parser.parse_query(query, context)
+    return _PARSER_SINGLETON.parse_query(query, context)